@@ -1,5 +1,8 @@
 from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi.responses import StreamingResponse
 from typing import Annotated
+import json
+import logging
 
 # 1. Importamos Seguridad (Igual que en documents.py)
 from app.dependencies import get_current_user
@@ -12,6 +15,8 @@ from src.services.solver.service import SolverService
 from src.shared.vectordb.qdrant import QdrantService
 from src.services.ai.service import AIService
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(
     prefix="/solver",
     tags=["Solver (TutorIA V2)"]
@@ -48,8 +53,39 @@ async def ask_tutor_v2(
         return response
 
     except Exception as e:
-        print(f"❌ ERROR SOLVER V2: {str(e)}")
+        logger.error(f"❌ ERROR SOLVER V2: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"TutorIA tuvo un problema interno: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+@router.post("/ask/stream")
+async def ask_tutor_v2_stream(
+    request_body: SolverRequest,
+    current_user = Depends(get_current_user), # 🔒 PROTEGIDO CON JWT
+    service: SolverService = Depends(get_solver_service)
+):
+    """
+    Igual que /ask, pero en streaming (Server-Sent Events).
+    - Eventos "partial": JSON parcial de la respuesta según se genera.
+    - Evento "final": SolverResponse completo con fuentes.
+    - Evento "error" si algo falla a mitad del stream.
+    """
+    request_body.user_id = str(current_user.id)
+
+    async def event_stream():
+        try:
+            async for event in service.stream_doubt(request_body):
+                data = event["data"]
+                if hasattr(data, "model_dump"):
+                    # mode="json": datetime/UUID salen como str y json.dumps
+                    # no falla a mitad del stream
+                    data = data.model_dump(mode="json")
+                yield f"event: {event['type']}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+        except Exception as e:
+            # La respuesta HTTP ya empezó: el error viaja como evento
+            logger.error(f"❌ ERROR SOLVER V2 (stream): {str(e)}")
+            error = {"detail": f"TutorIA tuvo un problema interno: {str(e)}"}
+            yield f"event: error\ndata: {json.dumps(error, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
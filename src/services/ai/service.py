@@ -1,5 +1,5 @@
 import logging
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, Union, AsyncIterator
 import openai
 from openai import AsyncOpenAI
 from tenacity import (
@@ -168,6 +168,45 @@ class AIService:
             logger.error(f"❌ Error generando respuesta estructurada: {e}")
             raise e
 
+    async def stream_structured_response(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        response_model: Any,
+        temperature: float = 0.3
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Variante en streaming de generate_structured_response.
+        Emite el JSON parcial (dict) según llegan los tokens; el último
+        elemento es la respuesta completa y validada contra response_model.
+        Sin reintentos: una vez emitido un parcial no se puede repetir la llamada.
+        """
+        try:
+            async with self.client.beta.chat.completions.stream(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                response_format=response_model,
+                temperature=temperature,
+            ) as stream:
+                async for event in stream:
+                    if event.type == "content.delta" and event.parsed:
+                        yield event.parsed
+
+                completion = await stream.get_final_completion()
+
+            parsed_obj = completion.choices[0].message.parsed
+            if not parsed_obj:
+                raise ValueError("OpenAI devolvió una respuesta vacía o inválida.")
+
+            yield parsed_obj.model_dump()
+
+        except Exception as e:
+            logger.error(f"❌ Error en streaming de respuesta estructurada: {e}")
+            raise e
+
     # -------------------------------------------------------------------------
     # 3. LEGACY / COMPATIBILIDAD
     # -------------------------------------------------------------------------
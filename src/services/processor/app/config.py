@@ -35,6 +35,9 @@ class Settings(BaseSettings):
     minio_secret_key: str = os.getenv("MINIO_PASSWORD", "TutorIA_Secure_Pass_2024!")
     minio_bucket_name: str = "documents"
     minio_secure: bool = False
+    # Conexiones HTTP reutilizables hacia MinIO (llamadas concurrentes vía
+    # asyncio.to_thread: debe cubrir los uploads/downloads en paralelo)
+    minio_max_connections: int = int(os.getenv("MINIO_MAX_CONNECTIONS", "20"))
     
     # --- INICIO CAMBIOS R#8 (REDIS HA) ---
     # Redis Sentinel settings
@@ -42,6 +45,10 @@ class Settings(BaseSettings):
     redis_sentinel_port: int = int(os.getenv("REDIS_SENTINEL_PORT", "26379"))
     redis_master_set: str = os.getenv("REDIS_MASTER_SET", "tutormaster")
     redis_password: str = os.getenv("REDIS_PASSWORD", "redis_password")
+    # Pool bloqueante: con el pool lleno se espera hasta redis_pool_timeout
+    # segundos en lugar de fallar con "Too many connections"
+    redis_max_connections: int = int(os.getenv("REDIS_MAX_CONNECTIONS", "20"))
+    redis_pool_timeout: float = float(os.getenv("REDIS_POOL_TIMEOUT", "1.0"))
     
     # (Opcional) Mantenemos estos por compatibilidad si algún test lo usa, 
     # pero el código principal usará Sentinel.
@@ -7,6 +7,7 @@ import logging
 from typing import Optional, Dict, Any
 from datetime import datetime
 import io
+import urllib3
 from minio import Minio
 from minio.error import S3Error
 from app.config import get_settings
@@ -28,12 +29,26 @@ class MinIOClient:
         logger.info(f"🔗 Conectando a MinIO en {self.endpoint}")
         
         try:
+            # Pool HTTP propio: el de por defecto (10 conexiones) se queda
+            # corto con varias subidas concurrentes
+            http_client = urllib3.PoolManager(
+                num_pools=1,
+                maxsize=settings.minio_max_connections,
+                timeout=urllib3.Timeout(connect=5, read=300),
+                retries=urllib3.Retry(
+                    total=3,
+                    backoff_factor=0.1,
+                    status_forcelist=[500, 502, 503, 504]
+                )
+            )
+            
             # Crear cliente
             self.client = Minio(
                 self.endpoint,
                 access_key=self.access_key,
                 secret_key=self.secret_key,
-                secure=False  # No usar HTTPS en desarrollo
+                secure=False,  # No usar HTTPS en desarrollo
+                http_client=http_client
             )
             
             # Verificar conexión y crear buckets si no existen
@@ -1,6 +1,6 @@
 import aio_pika
 from aio_pika import Message, DeliveryMode
-from typing import Optional, Dict, Any, Callable
+from typing import Optional, Dict, Any, Callable, List
 import json
 import structlog
 import asyncio
@@ -9,6 +9,9 @@ from ..config import get_settings
 logger = structlog.get_logger()
 settings = get_settings()
 
+# Publicaciones en vuelo por ventana en publish_tasks
+PUBLISH_WINDOW = 200
+
 class RabbitMQClient:
     def __init__(self):
         self.connection: Optional[aio_pika.Connection] = None
@@ -70,20 +73,23 @@ class RabbitMQClient:
         if self.connection and not self.connection.is_closed:
             await self.connection.close()
             
+    @staticmethod
+    def _build_message(task_data: Dict[str, Any]) -> Message:
+        """Construir el mensaje persistente de una tarea"""
+        return Message(
+            body=json.dumps(task_data).encode(),
+            delivery_mode=DeliveryMode.PERSISTENT,
+            content_type="application/json",
+            headers={
+                "task_type": task_data.get("type", "process_document")
+            }
+        )
+    
     async def publish_task(self, task_data: Dict[str, Any]) -> bool:
         """Publicar tarea de procesamiento"""
         try:
-            message = Message(
-                body=json.dumps(task_data).encode(),
-                delivery_mode=DeliveryMode.PERSISTENT,
-                content_type="application/json",
-                headers={
-                    "task_type": task_data.get("type", "process_document")
-                }
-            )
-            
             await self.exchange.publish(
-                message,
+                self._build_message(task_data),
                 routing_key=self.routing_key
             )
             
@@ -95,6 +101,42 @@ class RabbitMQClient:
             logger.error("Failed to publish task", error=str(e))
             return False
     
+    async def publish_tasks(self, tasks: List[Dict[str, Any]]) -> int:
+        """
+        Publicar varias tareas de forma concurrente.
+        
+        El canal tiene publisher confirms activados (por defecto en aio-pika),
+        así que cada publish espera su confirmación. En lugar de esperar una
+        por una, se lanzan en ventanas de PUBLISH_WINDOW con asyncio.gather.
+        
+        Returns:
+            Número de tareas confirmadas por el broker
+        """
+        published = 0
+        for start in range(0, len(tasks), PUBLISH_WINDOW):
+            window = tasks[start:start + PUBLISH_WINDOW]
+            results = await asyncio.gather(
+                *[
+                    self.exchange.publish(
+                        self._build_message(task_data),
+                        routing_key=self.routing_key
+                    )
+                    for task_data in window
+                ],
+                return_exceptions=True
+            )
+            
+            for task_data, result in zip(window, results):
+                if isinstance(result, BaseException):
+                    logger.error("Failed to publish task",
+                               job_id=task_data.get("job_id"),
+                               error=str(result))
+                else:
+                    published += 1
+        
+        logger.info("Tasks published", published=published, total=len(tasks))
+        return published
+    
     async def consume_tasks(self, callback: Callable) -> None:
         """Consumir tareas de la cola"""
         try:
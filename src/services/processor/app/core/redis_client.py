@@ -1,17 +1,65 @@
 import redis.asyncio as redis
-from redis.asyncio.sentinel import Sentinel
+from redis.asyncio.sentinel import Sentinel, SentinelConnectionPool
 from typing import Optional, Any
 import json
 import structlog
+try:
+    import orjson
+except ImportError:  # orjson es opcional: mismo resultado con json estándar
+    orjson = None
+
 from ..config import get_settings
 
 logger = structlog.get_logger()
 settings = get_settings()
 
+
+def _dumps(value: Any):
+    """
+    Serializa a JSON aceptando lo mismo que antes con json.dumps: claves no
+    str (int, etc.) y, con default=str, tipos como datetime o UUID.
+    orjson devuelve bytes; redis-py los escribe tal cual.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS, default=str)
+    return json.dumps(value, default=str)
+
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+# El estado de un job se guarda como hash: un campo por clave, con el valor
+# en JSON. Una actualización parcial es un HSET de los campos cambiados en el
+# propio Redis (un solo round-trip); Lua nunca decodifica el JSON, así que no
+# hay pérdidas de cjson (listas vacías como {}, números a 14 dígitos)
+_UPDATE_FIELDS_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return nil
+end
+redis.call('HSET', KEYS[1], unpack(ARGV, 2))
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return redis.call('HGETALL', KEYS[1])
+"""
+
+
+def _encode_fields(status: dict) -> dict:
+    """Campo -> valor en JSON, para HSET"""
+    return {field: _dumps(value) for field, value in status.items()}
+
+
+def _decode_fields(fields: dict) -> dict:
+    """Inverso de _encode_fields sobre el resultado de HGETALL"""
+    return {field: _loads(value) for field, value in fields.items()}
+
+
+class BlockingSentinelConnectionPool(SentinelConnectionPool, redis.BlockingConnectionPool):
+    """Pool gestionado por Sentinel que espera conexión libre en vez de fallar"""
+
+
 class RedisClient:
     def __init__(self):
         self.redis: Optional[redis.Redis] = None
         self.sentinel: Optional[Sentinel] = None
+        self._update_script = None
         
     async def connect(self):
         """Inicializar conexión a Redis vía Sentinel para HA"""
@@ -34,6 +82,9 @@ class RedisClient:
             # Esto devuelve un cliente Redis asíncrono configurado para el master actual
             self.redis = self.sentinel.master_for(
                 settings.redis_master_set,
+                connection_pool_class=BlockingSentinelConnectionPool,
+                max_connections=settings.redis_max_connections,
+                timeout=settings.redis_pool_timeout,
                 password=settings.redis_password,
                 encoding="utf-8",
                 decode_responses=True,
@@ -42,6 +93,8 @@ class RedisClient:
                 health_check_interval=30
             )
 
+            self._update_script = self.redis.register_script(_UPDATE_FIELDS_LUA)
+
             # 4. Verificar conexión real haciendo un PING al master
             await self.redis.ping()
             logger.info("✅ Redis HA connection successful (via Sentinel)")
@@ -61,14 +114,14 @@ class RedisClient:
     async def get(self, key: str) -> Optional[Any]:
         try:
             value = await self.redis.get(key)
-            return json.loads(value) if value else None
+            return _loads(value) if value else None
         except Exception as e:
             logger.error("Redis get error", key=key, error=str(e))
             return None
 
     async def set(self, key: str, value: Any, expire: int = 3600) -> bool:
         try:
-            serialized = json.dumps(value)
+            serialized = _dumps(value)
             await self.redis.setex(key, expire, serialized)
             return True
         except Exception as e:
@@ -90,13 +143,51 @@ class RedisClient:
             logger.error("Redis exists error", key=key, error=str(e))
             return False
 
-    async def set_job_status(self, job_id: str, status: dict, expire: int = 86400):
+    async def set_job_status(self, job_id: str, status: dict, expire: int = 86400) -> bool:
         key = f"job:status:{job_id}"
-        await self.set(key, status, expire)
+        try:
+            # Reemplaza el estado completo en una sola transacción
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.delete(key)
+                if status:
+                    pipe.hset(key, mapping=_encode_fields(status))
+                    pipe.expire(key, expire)
+                await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error("Redis set error", key=key, error=str(e))
+            return False
 
     async def get_job_status(self, job_id: str) -> Optional[dict]:
         key = f"job:status:{job_id}"
-        return await self.get(key)
+        try:
+            fields = await self.redis.hgetall(key)
+            return _decode_fields(fields) if fields else None
+        except Exception as e:
+            logger.error("Redis get error", key=key, error=str(e))
+            return None
+
+    async def update_job_status(self, job_id: str, changes: dict, expire: int = 86400) -> Optional[dict]:
+        """
+        Actualizar campos del estado de un job sin leerlo antes (HSET en Redis)
+        
+        Returns:
+            Estado completo tras la actualización, o None si el job no existe
+        """
+        key = f"job:status:{job_id}"
+        if not changes:
+            return await self.get_job_status(job_id)
+        args = [expire]
+        for field, value in _encode_fields(changes).items():
+            args += [field, value]
+        try:
+            flat = await self._update_script(keys=[key], args=args)
+            if not flat:
+                return None
+            return _decode_fields(dict(zip(flat[::2], flat[1::2])))
+        except Exception as e:
+            logger.error("Redis update error", key=key, error=str(e))
+            return None
 
     async def increment_counter(self, key: str) -> int:
         try:
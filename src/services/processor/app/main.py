@@ -343,11 +343,11 @@ async def cancel_job(job_id: str):
     Cancelar un trabajo de procesamiento
     """
     if connections["redis"]:
-        job_data = await redis_client.get_job_status(job_id)
+        job_data = await redis_client.update_job_status(job_id, {
+            "status": "cancelled",
+            "cancelled_at": datetime.utcnow().isoformat()
+        })
         if job_data:
-            job_data["status"] = "cancelled"
-            job_data["cancelled_at"] = datetime.utcnow().isoformat()
-            await redis_client.set_job_status(job_id, job_data)
             
             # Opcional: Eliminar archivo de MinIO
             if job_data.get("minio_path") and connections["minio"] and minio_client:
@@ -4,16 +4,49 @@ Queue Producer - SIMPLIFIED VERSION
 Envía trabajos a las colas de RabbitMQ sin declarar exchange en connect
 """
 import pika
+from pika.exceptions import ChannelClosedByBroker
 import json
-import uuid
+import functools
+import itertools
+import secrets
 import logging
 import os
-from typing import Dict, Any, Optional
-from datetime import datetime
+import time
+from typing import Dict, Any, List, Optional
 
 logger = logging.getLogger(__name__)
 
+# Prefijo aleatorio por proceso + contador monótono: IDs únicos sin leer
+# /dev/urandom ni formatear un UUID en cada publicación
+_JOB_PREFIX = secrets.token_hex(4)
+_COUNTER = itertools.count()
+
+# Notificaciones (cola 'notifications', ver shared/rabbitmq/rabbitmq_setup.py)
+NOTIFY_EXCHANGE = 'tutor.direct'
+NOTIFY_ROUTING_KEY = 'notify'
+
+# Propiedades fijas de los jobs de PDF, creadas una sola vez
+_PROPS_NORMAL = pika.BasicProperties(
+    delivery_mode=2,  # Mensaje persistente
+    content_type='application/json',
+    priority=5
+)
+_PROPS_PRIORITY = pika.BasicProperties(
+    delivery_mode=2,
+    content_type='application/json',
+    priority=10
+)
+
+
+def new_job_id() -> str:
+    """Genera un job_id único (prefijo de proceso + contador hexadecimal)"""
+    return f"{_JOB_PREFIX}{next(_COUNTER):012x}"
+
 class QueueProducer:
+    # URLs cuya topología ya se ha declarado en este proceso: las
+    # declaraciones son idempotentes, basta con hacerlas una vez
+    _topology_declared: set = set()
+    
     def __init__(self, rabbitmq_url: str = None):
         """
         Inicializa el productor de mensajes
@@ -28,6 +61,15 @@ class QueueProducer:
         )
         self.connection = None
         self.channel = None
+        
+        # Variantes ya especializadas del publish de jobs (routing key y
+        # propiedades fijadas): el camino caliente no evalúa la prioridad
+        self._publish_normal = functools.partial(
+            self._publish, routing_key='pdf.process', properties=_PROPS_NORMAL
+        )
+        self._publish_priority = functools.partial(
+            self._publish, routing_key='pdf.process.priority', properties=_PROPS_PRIORITY
+        )
         logger.info(f"Configurando QueueProducer con URL: {self.rabbitmq_url}")
         
     def connect(self):
@@ -54,6 +96,27 @@ class QueueProducer:
         """Asegura que el exchange y la cola existan - llamar solo cuando sea necesario"""
         if not self.channel:
             return False
+        
+        if self.rabbitmq_url in self._topology_declared:
+            return True
+        
+        try:
+            # Comprobación pasiva: si todo existe no hace falta redeclarar
+            self.channel.exchange_declare(exchange='tutor.processing', passive=True)
+            self.channel.exchange_declare(exchange=NOTIFY_EXCHANGE, passive=True)
+            self.channel.queue_declare(queue='pdf_processing', passive=True)
+            
+            self._topology_declared.add(self.rabbitmq_url)
+            logger.info("Topología ya existente en el broker")
+            return True
+            
+        except ChannelClosedByBroker as e:
+            # 404: falta algo. El broker cierra el canal, abrir uno nuevo
+            logger.info(f"Topología incompleta ({e.reply_code}), declarando...")
+            self.channel = self.connection.channel()
+        except Exception as e:
+            logger.error(f"Error comprobando exchange/cola: {e}")
+            return False
             
         try:
             # Declarar el exchange si no existe
@@ -86,6 +149,14 @@ class QueueProducer:
                 routing_key='pdf.process.priority'
             )
             
+            # Exchange de notificaciones
+            self.channel.exchange_declare(
+                exchange=NOTIFY_EXCHANGE,
+                exchange_type='direct',
+                durable=True
+            )
+            
+            self._topology_declared.add(self.rabbitmq_url)
             logger.info("Exchange y cola configurados correctamente")
             return True
             
@@ -100,7 +171,8 @@ class QueueProducer:
         user_id: str,
         priority: bool = False,
         require_analysis: bool = True,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        job_id: Optional[str] = None
     ) -> str:
         """
         Envía un trabajo de procesamiento de PDF a la cola
@@ -112,55 +184,168 @@ class QueueProducer:
             priority: Si es prioritario
             require_analysis: Si requiere análisis de IA posterior
             metadata: Metadata adicional
+            job_id: ID ya asignado por el llamador (se genera si no se indica)
             
         Returns:
             job_id del trabajo creado
         """
-        if not self.channel or not self.connection or self.connection.is_closed:
-            if not self.connect():
-                raise Exception("No se pudo conectar a RabbitMQ")
-            # Asegurar que el exchange y cola existan antes de enviar
-            self.ensure_exchange_and_queue()
+        self._ensure_connected()
         
-        job_id = str(uuid.uuid4())
+        job_id = job_id or new_job_id()
+        message = self._build_job_message(
+            job_id, filename, file_path, user_id, require_analysis, metadata
+        )
         
-        message = {
-            'job_id': job_id,
-            'filename': filename,
-            'file_path': file_path,
+        try:
+            (self._publish_priority if priority else self._publish_normal)(
+                body=json.dumps(message)
+            )
+            
+            logger.info(f"✅ Job enviado: {job_id} - {filename}")
+            return job_id
+            
+        except Exception as e:
+            logger.error(f"❌ Error enviando job: {e}")
+            # Intentar reconectar para el próximo mensaje
+            self.connection = None
+            self.channel = None
+            raise
+    
+    def send_pdf_processing_jobs(self, jobs: List[Dict[str, Any]]) -> List[str]:
+        """
+        Envía varios trabajos de PDF reutilizando la conexión y el canal
+        
+        Args:
+            jobs: Lista de dicts con los mismos argumentos que
+                send_pdf_processing_job (filename, file_path, user_id, ...)
+            
+        Returns:
+            Lista de job_id en el mismo orden que `jobs`
+        """
+        self._ensure_connected()
+        
+        job_ids = []
+        try:
+            for job in jobs:
+                job_id = new_job_id()
+                publish = self._publish_priority if job.get('priority', False) else self._publish_normal
+                message = self._build_job_message(
+                    job_id,
+                    job['filename'],
+                    job['file_path'],
+                    job['user_id'],
+                    job.get('require_analysis', True),
+                    job.get('metadata')
+                )
+                publish(body=json.dumps(message))
+                job_ids.append(job_id)
+            
+            logger.info(f"✅ {len(job_ids)} jobs enviados en lote")
+            return job_ids
+            
+        except Exception as e:
+            logger.error(f"❌ Error enviando lote de jobs: {e}")
+            self.connection = None
+            self.channel = None
+            raise
+    
+    def send_notification(
+        self,
+        user_id: str,
+        notification_type: str,
+        content: Dict[str, Any]
+    ) -> str:
+        """
+        Envía una notificación (email, push...) a la cola de notificaciones.
+        Son efímeras: se publican como transitorias (delivery_mode=1) para
+        que RabbitMQ no tenga que persistirlas a disco.
+        
+        Args:
+            user_id: ID del usuario destinatario
+            notification_type: Tipo de notificación (email, push...)
+            content: Contenido de la notificación
+            
+        Returns:
+            ID de la notificación
+        """
+        self._ensure_connected()
+        
+        notification_id = new_job_id()
+        notification = {
+            'notification_id': notification_id,
             'user_id': user_id,
-            'require_analysis': require_analysis,
-            'created_at': datetime.utcnow().isoformat(),
-            'metadata': metadata or {}
+            'type': notification_type,
+            'content': content,
+            'created_at_ms': time.time_ns() // 1_000_000
         }
         
-        # Determinar routing key según prioridad
-        routing_key = 'pdf.process.priority' if priority else 'pdf.process'
-        
         try:
-            # Si usamos el exchange default (vacío), no necesitamos routing key especial
-            # Pero si usamos un exchange custom, sí
-            self.channel.basic_publish(
-                exchange='tutor.processing',  # Usar el exchange custom
-                routing_key=routing_key,
-                body=json.dumps(message),
+            self._publish(
+                exchange=NOTIFY_EXCHANGE,
+                routing_key=NOTIFY_ROUTING_KEY,
+                body=json.dumps(notification),
                 properties=pika.BasicProperties(
-                    delivery_mode=2,  # Mensaje persistente
-                    content_type='application/json',
-                    priority=10 if priority else 5
+                    delivery_mode=1,  # Transitorio: sin fsync en el broker
+                    content_type='application/json'
                 )
             )
             
-            logger.info(f"✅ Job enviado: {job_id} - {filename}")
-            return job_id
+            logger.info(f"✅ Notificación enviada: {notification_id} ({notification_type})")
+            return notification_id
             
         except Exception as e:
-            logger.error(f"❌ Error enviando job: {e}")
-            # Intentar reconectar para el próximo mensaje
+            logger.error(f"❌ Error enviando notificación: {e}")
             self.connection = None
             self.channel = None
             raise
     
+    def _ensure_connected(self):
+        """Reconecta (y asegura la topología) si no hay canal abierto"""
+        if not self.channel or not self.connection or self.connection.is_closed:
+            if not self.connect():
+                raise Exception("No se pudo conectar a RabbitMQ")
+            # Asegurar que el exchange y cola existan antes de enviar
+            self.ensure_exchange_and_queue()
+    
+    @staticmethod
+    def _build_job_message(
+        job_id: str,
+        filename: str,
+        file_path: str,
+        user_id: str,
+        require_analysis: bool,
+        metadata: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        return {
+            'job_id': job_id,
+            'filename': filename,
+            'file_path': file_path,
+            'user_id': user_id,
+            'require_analysis': require_analysis,
+            'created_at_ms': time.time_ns() // 1_000_000,
+            'metadata': metadata or {}
+        }
+    
+    def _publish(
+        self,
+        routing_key: str,
+        body: str,
+        properties: pika.BasicProperties,
+        exchange: str = 'tutor.processing'
+    ):
+        """
+        Publica con el basic_publish público de BlockingChannel. Sin publisher
+        confirms no espera respuesta del broker: cada llamada solo escribe
+        sus tramas en el socket.
+        """
+        self.channel.basic_publish(
+            exchange=exchange,
+            routing_key=routing_key,
+            body=body,
+            properties=properties,
+            mandatory=False
+        )
+    
     def close(self):
         """Cierra la conexión con RabbitMQ"""
         if self.connection and not self.connection.is_closed:
@@ -7,13 +7,13 @@ Endpoint simple para subir archivos al sistema de colas
 from fastapi import FastAPI, UploadFile, File, HTTPException
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
-import uuid
 import logging
 from datetime import datetime
 import os
+import time
 
 # Importar el productor que ya funciona
-from producers.queue_producer import QueueProducer
+from producers.queue_producer import QueueProducer, new_job_id
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
@@ -77,7 +77,7 @@ async def upload_file(file: UploadFile = File(...)):
             raise HTTPException(status_code=400, detail="No se proporcionó archivo")
         
         # Generar job_id
-        job_id = str(uuid.uuid4())
+        job_id = new_job_id()
         
         # Crear ruta del archivo (simulada)
         file_path = f"uploads/{job_id}/{file.filename}"
@@ -91,7 +91,7 @@ async def upload_file(file: UploadFile = File(...)):
             "job_id": job_id,
             "status": "queued",
             "filename": file.filename,
-            "created_at": datetime.utcnow().isoformat(),
+            "created_at_ms": time.time_ns() // 1_000_000,
             "file_size": file_size,
             "result": None,
             "error": None
@@ -105,10 +105,11 @@ async def upload_file(file: UploadFile = File(...)):
                 user_id="anonymous",  # TODO: Obtener del contexto de autenticación
                 priority=False,
                 require_analysis=True,
+                job_id=job_id,
                 metadata={
                     "size_bytes": file_size,
                     "content_type": file.content_type,
-                    "upload_timestamp": datetime.utcnow().isoformat()
+                    "upload_timestamp_ms": time.time_ns() // 1_000_000
                 }
             )
             
@@ -178,7 +179,7 @@ async def get_job_result(job_id: str):
         "filename": job["filename"],
         "status": job["status"],
         "result": job["result"],
-        "processed_at": job.get("processed_at")
+        "processed_at_ms": job.get("processed_at_ms")
     }
 
 @app.post("/update_status/{job_id}")
@@ -199,14 +200,26 @@ def update_job_status(job_id: str, status: str, result: dict = None, error: str
     """Actualizar el estado de un job (usado por los workers)"""
     if job_id in jobs_db:
         jobs_db[job_id]["status"] = status
-        jobs_db[job_id]["updated_at"] = datetime.utcnow().isoformat()
+        now_ms = time.time_ns() // 1_000_000
+        jobs_db[job_id]["updated_at_ms"] = now_ms
         if result:
             jobs_db[job_id]["result"] = result
-            jobs_db[job_id]["processed_at"] = datetime.utcnow().isoformat()
+            jobs_db[job_id]["processed_at_ms"] = now_ms
         if error:
             jobs_db[job_id]["error"] = error
         logger.info(f"📊 Job {job_id} actualizado: {status}")
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8003)
+    # uvloop + httptools vienen con uvicorn[standard]. jobs_db vive en la
+    # memoria de cada proceso, así que API_WORKERS > 1 solo es seguro cuando
+    # el estado de los jobs se comparta fuera del proceso
+    uvicorn.run(
+        "simple_api:app",
+        host="0.0.0.0",
+        port=8003,
+        workers=int(os.getenv("API_WORKERS", "1")),
+        loop="uvloop",
+        http="httptools",
+        log_level="warning"
+    )
@@ -12,11 +12,15 @@ from pathlib import Path
 # URL base de la API simple
 BASE_URL = "http://localhost:8003"
 
+# Una sola sesión para todas las pruebas: keep-alive reutiliza la conexión TCP
+SESSION = requests.Session()
+SESSION.headers.update({'Connection': 'keep-alive'})
+
 def test_health():
     """Prueba el endpoint de health"""
     print("\n🏥 Probando Health Check...")
     try:
-        response = requests.get(f"{BASE_URL}/health")
+        response = SESSION.get(f"{BASE_URL}/health")
         print(f"Status: {response.status_code}")
         if response.status_code == 200:
             print(f"Response: {json.dumps(response.json(), indent=2)}")
@@ -40,7 +44,7 @@ def test_upload():
     }
     
     try:
-        response = requests.post(f"{BASE_URL}/upload", files=files)
+        response = SESSION.post(f"{BASE_URL}/upload", files=files)
         print(f"Status: {response.status_code}")
         
         if response.status_code == 200:
@@ -59,7 +63,7 @@ def test_status(job_id):
     print(f"\n📊 Probando Status del job: {job_id}")
     
     try:
-        response = requests.get(f"{BASE_URL}/status/{job_id}")
+        response = SESSION.get(f"{BASE_URL}/status/{job_id}")
         print(f"Status: {response.status_code}")
         
         if response.status_code == 200:
@@ -78,7 +82,7 @@ def test_result(job_id):
     print(f"\n📄 Probando Result del job: {job_id}")
     
     try:
-        response = requests.get(f"{BASE_URL}/result/{job_id}")
+        response = SESSION.get(f"{BASE_URL}/result/{job_id}")
         print(f"Status: {response.status_code}")
         
         if response.status_code == 200:
@@ -107,7 +111,7 @@ def test_update_status(job_id):
     }
     
     try:
-        response = requests.post(f"{BASE_URL}/update_status/{job_id}", json=update_data)
+        response = SESSION.post(f"{BASE_URL}/update_status/{job_id}", json=update_data)
         print(f"Status: {response.status_code}")
         
         if response.status_code == 200:
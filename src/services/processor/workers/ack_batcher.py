@@ -0,0 +1,100 @@
+import asyncio
+import collections
+import logging
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import aio_pika
+
+logger = logging.getLogger("EngineeringWorkerAsync")
+
+_SETTLED = object()
+
+
+class AckBatcher:
+    """
+    Agrupa ACKs en un único basic.ack con multiple=True.
+    
+    Solo se agrupa el tramo contiguo: el mensaje en proceso más antiguo y
+    los que terminan detrás de él. Un mensaje que termina mientras otro
+    anterior sigue en proceso se confirma en el momento, por separado: si
+    esperase, un PDF largo retendría todas las entregas posteriores y
+    agotaría el prefetch del canal.
+    """
+
+    def __init__(self, batch_size: int, interval: float):
+        self.batch_size = batch_size
+        self.interval = interval
+        # delivery_tag -> None (en proceso), mensaje (listo) o _SETTLED
+        # (confirmado o rechazado por separado)
+        self._outstanding = collections.OrderedDict()
+        self._ready = None
+        self._pending = 0
+        self._channel = None
+
+    def track(self, message: "aio_pika.IncomingMessage"):
+        if message.channel is not self._channel:
+            # Canal nuevo (reconexión): los tags anteriores ya no son válidos
+            self._channel = message.channel
+            self._outstanding.clear()
+            self._ready = None
+            self._pending = 0
+        self._outstanding[message.delivery_tag] = None
+
+    def _is_current(self, message: "aio_pika.IncomingMessage") -> bool:
+        # Un mensaje de un canal anterior puede compartir delivery tag con uno
+        # del canal actual: se ignora (el broker ya lo reentregó al caer el canal)
+        return message.channel is self._channel and message.delivery_tag in self._outstanding
+
+    def is_pending(self, message: "aio_pika.IncomingMessage") -> bool:
+        """True si el mensaje sigue en proceso (ni confirmado ni rechazado)"""
+        return self._is_current(message) and self._outstanding[message.delivery_tag] is None
+
+    async def done(self, message: "aio_pika.IncomingMessage"):
+        if not self.is_pending(message):
+            return
+        tag = message.delivery_tag
+        if tag != next(iter(self._outstanding)):
+            # Fuera de orden: hay uno anterior en proceso. Confirmarlo ya
+            # devuelve el crédito de prefetch sin esperar al lento
+            self._outstanding[tag] = _SETTLED
+            await message.ack()
+            return
+        self._outstanding[tag] = message
+        self._advance()
+        if self._pending >= self.batch_size:
+            await self.flush()
+
+    async def failed(self, message: "aio_pika.IncomingMessage"):
+        if not self.is_pending(message):
+            return
+        # Confirmar primero lo pendiente y después rechazar solo este mensaje
+        await self.flush()
+        await message.reject(requeue=False)
+        self._outstanding[message.delivery_tag] = _SETTLED
+        self._advance()
+
+    async def flush(self):
+        if self._ready is None:
+            return
+        message, self._ready, self._pending = self._ready, None, 0
+        await message.ack(multiple=True)
+
+    async def run_periodic_flush(self):
+        """Confirma los rezagados aunque no se llegue a batch_size"""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning("⚠️ Error confirmando lote de mensajes: %s", e)
+
+    def _advance(self):
+        while self._outstanding:
+            tag, state = next(iter(self._outstanding.items()))
+            if state is None:
+                break
+            self._outstanding.popitem(last=False)
+            if state is not _SETTLED:
+                self._ready = state
+                self._pending += 1
@@ -0,0 +1,114 @@
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import List, Dict, Optional, NamedTuple
+
+import numpy as np
+
+from src.services.solver.schemas import SolverResponse
+
+logger = logging.getLogger(__name__)
+
+# Caché semántica: una pregunta casi idéntica (parafraseada) de un mismo
+# usuario, con el mismo contexto recuperado, reutiliza la respuesta anterior
+# sin volver a llamar al LLM
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", 0.88))
+SEMANTIC_CACHE_TTL = int(os.getenv("SEMANTIC_CACHE_TTL", 24 * 3600))
+SEMANTIC_CACHE_PER_USER = int(os.getenv("SEMANTIC_CACHE_PER_USER", 256))
+# Límite global del proceso (~6 KB de vector float32 por entrada + respuesta)
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", 10_000))
+# Cada cuánto se barren las entradas caducadas de todos los usuarios
+SEMANTIC_CACHE_SWEEP_INTERVAL = 60
+
+
+class _CacheEntry(NamedTuple):
+    user_id: str
+    context: str
+    expires_at: float
+    vector: np.ndarray
+    response: SolverResponse
+
+
+class SemanticCache:
+    """
+    Respuestas recientes por usuario indexadas por el embedding de la
+    pregunta. Los embeddings de OpenAI vienen normalizados, así que el
+    producto escalar es la similitud coseno.
+    Cada entrada guarda la huella del contexto recuperado (chunks de Qdrant)
+    con el que se generó: solo se reutiliza si la búsqueda actual devuelve
+    los mismos chunks, así un documento borrado o reindexado invalida las
+    respuestas que lo usaban.
+    LRU global de max_entries entradas, con max_per_user por usuario y TTL.
+    """
+
+    def __init__(self, threshold: float, ttl: int, max_per_user: int, max_entries: int):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_per_user = max_per_user
+        self.max_entries = max_entries
+        # id de entrada -> entrada, de menos a más recientemente usada
+        self._entries: "OrderedDict[int, _CacheEntry]" = OrderedDict()
+        # user_id -> ids de sus entradas, de más antigua a más reciente
+        self._by_user: Dict[str, Dict[int, None]] = {}
+        self._next_id = 0
+        self._last_sweep = time.monotonic()
+
+    def get(self, user_id: str, vector: List[float], context: str) -> Optional[SolverResponse]:
+        now = time.monotonic()
+        self._sweep(now)
+
+        for entry_id in list(self._by_user.get(user_id, ())):
+            if self._entries[entry_id].expires_at <= now:
+                self._remove(entry_id)
+        entry_ids = [
+            i for i in self._by_user.get(user_id, ()) if self._entries[i].context == context
+        ]
+        if not entry_ids:
+            return None
+
+        # Una multiplicación matriz-vector en numpy (float32)
+        matrix = np.stack([self._entries[i].vector for i in entry_ids])
+        scores = matrix @ np.asarray(vector, dtype=np.float32)
+        best = int(np.argmax(scores))
+        best_score = float(scores[best])
+        if best_score < self.threshold:
+            return None
+
+        entry_id = entry_ids[best]
+        self._entries.move_to_end(entry_id)
+        logger.info(f"♻️ Caché semántica: respuesta reutilizada (similitud {best_score:.3f})")
+        return self._entries[entry_id].response.model_copy(deep=True)
+
+    def put(self, user_id: str, vector: List[float], context: str, response: SolverResponse):
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = _CacheEntry(
+            user_id=user_id,
+            context=context,
+            expires_at=time.monotonic() + self.ttl,
+            vector=np.asarray(vector, dtype=np.float32),
+            response=response.model_copy(deep=True),
+        )
+        user_ids = self._by_user.setdefault(user_id, {})
+        user_ids[entry_id] = None
+
+        if len(user_ids) > self.max_per_user:
+            self._remove(next(iter(user_ids)))
+        if len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, entry_id: int):
+        entry = self._entries.pop(entry_id)
+        user_ids = self._by_user[entry.user_id]
+        del user_ids[entry_id]
+        if not user_ids:
+            del self._by_user[entry.user_id]
+
+    def _sweep(self, now: float):
+        """Elimina las entradas caducadas, también las de usuarios que no vuelven"""
+        if now - self._last_sweep < SEMANTIC_CACHE_SWEEP_INTERVAL:
+            return
+        self._last_sweep = now
+        for entry_id in [i for i, e in self._entries.items() if e.expires_at <= now]:
+            self._remove(entry_id)
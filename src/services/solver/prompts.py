@@ -1,9 +1,12 @@
+import functools
 from typing import List, Dict, Any
 from src.services.learning.domain.entities import Language
 
 class SolverPromptManager:
     @staticmethod
+    @functools.lru_cache(maxsize=8)
     def get_system_prompt(language: Language = Language.ES) -> str:
+        # Constante por idioma: se construye una vez y se reutiliza
         base = """
         Eres "TutorIA", un mentor de ingeniería experto, paciente y riguroso.
         Tu misión NO es dar respuestas rápidas, sino garantizar el "Deep Understanding" (Comprensión Profunda).
@@ -32,13 +35,14 @@ class SolverPromptManager:
     @staticmethod
     def build_user_context_prompt(query: str, chunks: List[any], history: List[dict]) -> str:
         # Formateamos los apuntes
-        context_str = ""
         if chunks:
-            for i, chunk in enumerate(chunks):
+            # Lista + join: un único string final en vez de uno por fragmento
+            context_str = "".join(
                 # Intentamos sacar metadatos útiles
-                doc = chunk.metadata.get('filename', 'Documento desconocido')
-                page = chunk.metadata.get('page', '?')
-                context_str += f"--- FRAGMENTO {i+1} (Fuente: {doc}, Pág: {page}) ---\n{chunk.text}\n\n"
+                f"--- FRAGMENTO {i+1} (Fuente: {chunk.metadata.get('filename', 'Documento desconocido')}, "
+                f"Pág: {chunk.metadata.get('page', '?')}) ---\n{chunk.text}\n\n"
+                for i, chunk in enumerate(chunks)
+            )
         else:
             context_str = "SIN APUNTES DISPONIBLES O RELEVANTES."
 
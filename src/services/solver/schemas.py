@@ -9,6 +9,10 @@ class SolverRequest(BaseModel):
         default_factory=list, 
         description="Historial previo [{'role': 'user', 'content': '...'}, ...]"
     )
+    no_cache: bool = Field(
+        default=False,
+        description="True para no reutilizar ni guardar la respuesta en la caché semántica"
+    )
 
 # --- OUTPUT COMPONENTS (Lo que devuelve la IA) ---
 class SourceReference(BaseModel):
@@ -1,17 +1,40 @@
+import hashlib
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
 
-from src.shared.vectordb.qdrant import QdrantService
+from src.shared.vectordb.qdrant import QdrantService, SearchResult
 from src.services.ai.service import AIService
 from src.services.solver.schemas import SolverResponse, SourceReference, SolverRequest
 from src.services.solver.prompts import SolverPromptManager
+from src.services.solver.cache import (
+    SemanticCache,
+    SEMANTIC_CACHE_THRESHOLD,
+    SEMANTIC_CACHE_TTL,
+    SEMANTIC_CACHE_PER_USER,
+    SEMANTIC_CACHE_MAX_ENTRIES,
+)
 
 logger = logging.getLogger(__name__)
 
+# Compartida por todo el proceso: el gateway crea un SolverService por petición
+_semantic_cache = SemanticCache(
+    SEMANTIC_CACHE_THRESHOLD, SEMANTIC_CACHE_TTL, SEMANTIC_CACHE_PER_USER, SEMANTIC_CACHE_MAX_ENTRIES
+)
+
+
+def _context_fingerprint(search_results: List[SearchResult]) -> str:
+    """Huella de los chunks recuperados (id + texto), en orden"""
+    digest = hashlib.sha256()
+    for res in search_results:
+        digest.update(f"{res.id}\0{res.text}\0".encode("utf-8"))
+    return digest.hexdigest()
+
+
 class SolverService:
     def __init__(self, qdrant_service: QdrantService, ai_service: AIService):
         self.qdrant = qdrant_service
         self.ai = ai_service
+        self.cache = _semantic_cache
 
     async def solve_doubt(self, request: SolverRequest) -> SolverResponse:
         """
@@ -23,6 +46,87 @@ class SolverService:
         logger.info(f"🤔 Solver pensando: '{request.question}' para usuario {request.user_id}")
 
         # 1. RETRIEVAL (RAG)
+        search_results = await self._retrieve(request)
+
+        # 1b. CACHÉ SEMÁNTICA: solo se ahorra la llamada al LLM
+        query_vector, cached = await self._check_cache(request, search_results)
+        if cached is not None:
+            return cached
+
+        # 2. PROMPTS
+        system_prompt, user_prompt = self._prompts(request, search_results)
+        
+        # 3. GENERATION (AI)
+        raw_data = await self.ai.generate_structured_response(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            response_model=SolverResponse
+        )
+        
+        # 4. ENSAMBLAJE
+        response = self._assemble(raw_data, search_results)
+
+        if query_vector is not None:
+            self.cache.put(request.user_id, query_vector, _context_fingerprint(search_results), response)
+        
+        return response
+
+    async def stream_doubt(self, request: SolverRequest) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Mismo flujo que solve_doubt, pero emitiendo la respuesta mientras se genera:
+        {"type": "partial", "data": {...}} con el JSON parcial de la IA y, al
+        final, {"type": "final", "data": SolverResponse} con las fuentes.
+        """
+        logger.info(f"🤔 Solver (stream) pensando: '{request.question}' para usuario {request.user_id}")
+
+        search_results = await self._retrieve(request)
+        query_vector, cached = await self._check_cache(request, search_results)
+        if cached is not None:
+            yield {"type": "final", "data": cached}
+            return
+
+        system_prompt, user_prompt = self._prompts(request, search_results)
+
+        # El último elemento del stream es la respuesta completa: se emite
+        # cada parcial al llegar el siguiente
+        raw_data = None
+        async for data in self.ai.stream_structured_response(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            response_model=SolverResponse
+        ):
+            if raw_data is not None:
+                yield {"type": "partial", "data": raw_data}
+            raw_data = data
+
+        response = self._assemble(raw_data, search_results)
+
+        if query_vector is not None:
+            self.cache.put(request.user_id, query_vector, _context_fingerprint(search_results), response)
+
+        yield {"type": "final", "data": response}
+
+    async def _check_cache(
+        self, request: SolverRequest, search_results: List[SearchResult]
+    ) -> Tuple[Optional[List[float]], Optional[SolverResponse]]:
+        """
+        Devuelve (vector de la pregunta, respuesta cacheada). Vector None si la
+        caché no aplica. Solo sin historial: con conversación previa la
+        respuesta depende de ella. La respuesta cacheada solo vale si se generó
+        con los mismos chunks que devuelve ahora la búsqueda; sus fuentes se
+        rehacen con los resultados actuales
+        """
+        if request.no_cache or request.conversation_history:
+            return None, None
+        # Ya calculado por la búsqueda: sale de la caché de embeddings
+        query_vector = await self.qdrant.embed_query(request.question)
+        cached = self.cache.get(request.user_id, query_vector, _context_fingerprint(search_results))
+        if cached is not None:
+            cached.sources = self._sources(search_results)
+        return query_vector, cached
+
+    async def _retrieve(self, request: SolverRequest) -> List[SearchResult]:
+        """Recupera el contexto (RAG)"""
         # Buscamos chunks relevantes. Si no hay, Qdrant devuelve lista vacía []
         # Importante: Asumimos que tus metadatos tienen 'filename'.
         search_results = await self.qdrant.search(
@@ -30,26 +134,28 @@ class SolverService:
             limit=3,
             # filters={"user_id": request.user_id} # Descomenta cuando tengas ingesta por usuario
         )
-        
-        # 2. PREPARAR PROMPTS
+        return search_results
+
+    def _prompts(self, request: SolverRequest, search_results: List[SearchResult]) -> Tuple[str, str]:
+        """Construye los prompts con el contexto recuperado"""
         system_prompt = SolverPromptManager.get_system_prompt()
         user_prompt = SolverPromptManager.build_user_context_prompt(
             query=request.question, 
             chunks=search_results, 
             history=request.conversation_history
         )
-        
-        # 3. GENERATION (AI)
-        raw_data = await self.ai.generate_structured_response(
-            system_prompt=system_prompt,
-            user_prompt=user_prompt,
-            response_model=SolverResponse
-        )
-        
-        # 4. ENSAMBLAJE
+        return system_prompt, user_prompt
+
+    def _assemble(self, raw_data: Dict[str, Any], search_results) -> SolverResponse:
+        """Valida la respuesta de la IA e inyecta las fuentes reales encontradas"""
         response = SolverResponse(**raw_data)
         
         # Inyectamos las fuentes reales encontradas (si las hay)
+        response.sources = self._sources(search_results)
+        return response
+
+    def _sources(self, search_results: List[SearchResult]) -> List[SourceReference]:
+        """Fuentes para el frontend a partir de los chunks recuperados"""
         real_sources = []
         for res in search_results:
             # Solo añadimos fuentes si tienen una relevancia mínima (opcional)
@@ -61,6 +167,4 @@ class SolverService:
                     relevance=res.score
                 ))
         
-        response.sources = real_sources
-        
-        return response
\ No newline at end of file
+        return real_sources
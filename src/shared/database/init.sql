@@ -143,6 +143,8 @@ CREATE TABLE IF NOT EXISTS generated_exams (
 
 CREATE INDEX IF NOT EXISTS idx_generated_exams_course_id ON generated_exams(course_id);
 CREATE INDEX IF NOT EXISTS idx_generated_exams_student_id ON generated_exams(student_id);
+-- MEJORA: Exámenes de un alumno filtrados por estado (p.ej. los que siguen en proceso)
+CREATE INDEX IF NOT EXISTS idx_generated_exams_student_status ON generated_exams(student_id, status);
 
 GRANT ALL PRIVILEGES ON TABLE generated_exams TO app_user;
 
@@ -1,6 +1,6 @@
 import uuid
 import enum
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Integer, Text, Numeric
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Integer, Text, Numeric, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import UUID, JSONB  # Tipos nativos de Postgres
@@ -67,6 +67,10 @@ class Student(Base):
 
 class Course(Base):
     __tablename__ = "courses"
+    # Mismos nombres que en init.sql: create_all no duplica índices
+    __table_args__ = (
+        Index("idx_courses_student_id", "student_id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     student_id = Column(UUID(as_uuid=True), ForeignKey("students.id", ondelete="CASCADE"), nullable=False)
@@ -97,6 +101,12 @@ class GeneratedExam(Base):
     Sustituye a la antigua clase 'Exam' pero es más completa.
     """
     __tablename__ = "generated_exams"
+    __table_args__ = (
+        Index("idx_generated_exams_course_id", "course_id"),
+        Index("idx_generated_exams_student_id", "student_id"),
+        # "Exámenes de un alumno en un estado" (p.ej. los que siguen en proceso)
+        Index("idx_generated_exams_student_status", "student_id", "status"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     course_id = Column(UUID(as_uuid=True), ForeignKey("courses.id", ondelete="SET NULL"), nullable=True)
@@ -119,6 +129,9 @@ class ExamQuestion(Base):
     Cada pregunta individual dentro de un examen generado.
     """
     __tablename__ = "exam_questions"
+    __table_args__ = (
+        Index("idx_exam_questions_exam_id", "exam_id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     exam_id = Column(UUID(as_uuid=True), ForeignKey("generated_exams.id", ondelete="CASCADE"), nullable=False)
@@ -1,6 +1,7 @@
 from uuid import UUID
 from enum import Enum
-from pydantic import BaseModel
+from typing import Optional
+from pydantic import BaseModel, field_validator
 
 # 1. Tipos Cognitivos estrictos
 class CognitiveType(str, Enum):
@@ -18,4 +19,21 @@ class PDFGenerationJob(BaseModel):
     include_solutions: bool = False
 
     class Config:
-        use_enum_values = True
\ No newline at end of file
+        use_enum_values = True
+
+# 3. El job de procesamiento de PDF (api-gateway -> EngineeringWorkerAsync)
+# Los metadatos aceptan null igual que el antiguo data.get(campo, default):
+# un mensaje ya encolado o de otro productor con null no se descarta
+class PDFProcessingJob(BaseModel):
+    job_id: str
+    minio_object_key: str
+    minio_bucket: str = "uploads"
+    filename: Optional[str] = "unknown"
+    course_id: Optional[str] = "general"
+    university_id: Optional[str] = "global"
+    doc_type: Optional[str] = "notes"
+
+    @field_validator('minio_bucket', mode='before')
+    def default_bucket(cls, v):
+        # Un bucket null no se puede descargar: se usa el de subidas
+        return "uploads" if v is None else v
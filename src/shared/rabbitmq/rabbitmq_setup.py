@@ -2,19 +2,48 @@
 """
 RabbitMQ Setup Script
 Crea automáticamente las colas, exchanges y bindings necesarios para el sistema Tutor IA
+
+Cambios incompatibles con brokers existentes (se migran solos, ver
+RECREATE_ON_MISMATCH):
+- 'notifications' pasa a ser no durable: se borra y se recrea.
+- 'pdf.process' pasa a tener x-max-priority: se recrea solo si está vacía.
+- 'pdf.process.priority' desaparece (ver LEGACY_QUEUES): sigue enlazada a
+  'pdf.process.priority' y duplicaría los jobs urgentes.
 """
 
 import pika
+from pika.exceptions import ChannelClosedByBroker
 import json
 import os
 import sys
 from typing import Dict, List, Any
 import logging
 
+try:
+    from shared.rabbitmq.topology import (
+        PDF_ENGINEERING_QUEUE, RETRY_BUCKETS, retry_queue_name, retry_queue_arguments
+    )
+except ImportError:  # Ejecutado como script: python rabbitmq_setup.py
+    from topology import (
+        PDF_ENGINEERING_QUEUE, RETRY_BUCKETS, retry_queue_name, retry_queue_arguments
+    )
+
 # Configurar logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Colas cuya definición ha cambiado. Si el broker las tiene con argumentos
+# distintos (406 PRECONDITION_FAILED) se borran y se recrean.
+# nombre -> if_empty: True = no borrar si tiene mensajes (falla el setup)
+RECREATE_ON_MISMATCH = {
+    'notifications': False,  # Mensajes efímeros: se pueden descartar
+    'pdf.process': True,
+}
+
+# Colas que ya no forman parte de la topología. Se borran después de crear
+# los bindings nuevos, solo si están vacías
+LEGACY_QUEUES = ['pdf.process.priority']
+
 class RabbitMQSetup:
     def __init__(self, connection_url: str = None):
         """
@@ -42,6 +71,30 @@ class RabbitMQSetup:
             logger.error(f"❌ Error conectando a RabbitMQ: {e}")
             return False
     
+    def _reopen_channel(self):
+        """Un error del broker cierra el canal: abrir uno nuevo para seguir"""
+        if self.channel is None or self.channel.is_closed:
+            self.channel = self.connection.channel()
+
+    def _declare_queue(self, queue: Dict[str, Any]):
+        self.channel.queue_declare(
+            queue=queue['name'],
+            durable=queue['durable'],
+            arguments=queue.get('arguments', {})
+        )
+
+    def _recreate_queue(self, queue: Dict[str, Any]):
+        """Borra una cola declarada con otros argumentos y la vuelve a crear"""
+        if_empty = RECREATE_ON_MISMATCH[queue['name']]
+        logger.warning(f"⚠️  Cola {queue['name']} con definición antigua, recreando...")
+        try:
+            self.channel.queue_delete(queue=queue['name'], if_empty=if_empty)
+        except ChannelClosedByBroker as e:
+            self._reopen_channel()
+            logger.error(f"❌ No se pudo borrar {queue['name']} (¿tiene mensajes? vacíala antes): {e}")
+            raise
+        self._declare_queue(queue)
+
     def create_exchanges(self):
         """Crea los exchanges necesarios"""
         exchanges = [
@@ -75,12 +128,17 @@ class RabbitMQSetup:
                 )
                 logger.info(f"✅ Exchange creado: {exchange['name']}")
             except Exception as e:
-                logger.warning(f"⚠️  Exchange {exchange['name']} ya existe o error: {e}")
+                # Declarar algo que ya existe igual no da error: esto es un
+                # conflicto real y el canal queda cerrado. Parar aquí
+                logger.error(f"❌ Exchange {exchange['name']} error: {e}")
+                raise
     
     def create_queues(self):
         """Crea las colas con sus configuraciones"""
         queues = [
             {
+                # Una sola cola con prioridad: el broker entrega antes los
+                # mensajes con priority alta (los urgentes se publican con 10)
                 'name': 'pdf.process',
                 'durable': True,
                 'arguments': {
@@ -88,17 +146,6 @@ class RabbitMQSetup:
                     'x-dead-letter-exchange': 'tutor.dlx',
                     'x-dead-letter-routing-key': 'pdf.failed',
                     'x-max-length': 10000,
-                    'x-max-priority': 5
-                }
-            },
-            {
-                'name': 'pdf.process.priority',
-                'durable': True,
-                'arguments': {
-                    'x-message-ttl': 1800000,  # 30 minutos
-                    'x-dead-letter-exchange': 'tutor.dlx',
-                    'x-dead-letter-routing-key': 'pdf.failed.priority',
-                    'x-max-length': 1000,
                     'x-max-priority': 10
                 }
             },
@@ -123,13 +170,20 @@ class RabbitMQSetup:
                 }
             },
             {
+                # Notificaciones efímeras: cola no durable y mensajes transitorios
                 'name': 'notifications',
-                'durable': True,
+                'durable': False,
                 'arguments': {
                     'x-message-ttl': 300000,  # 5 minutos
                     'x-max-length': 100000
                 }
             },
+            {
+                # Entrada de EngineeringWorkerAsync (publica el api-gateway
+                # por el exchange por defecto)
+                'name': PDF_ENGINEERING_QUEUE,
+                'durable': True
+            },
             {
                 'name': 'dlx.failed',
                 'durable': True,
@@ -141,16 +195,27 @@ class RabbitMQSetup:
             }
         ]
         
+        # Colas de espera para reintentos del worker: TTL fijo y, al expirar,
+        # vuelven a PDF_ENGINEERING_QUEUE (ver shared/rabbitmq/topology.py)
+        queues += [
+            {
+                'name': retry_queue_name(ttl),
+                'durable': True,
+                'arguments': retry_queue_arguments(ttl)
+            }
+            for ttl in RETRY_BUCKETS
+        ]
+        
         for queue in queues:
             try:
-                self.channel.queue_declare(
-                    queue=queue['name'],
-                    durable=queue['durable'],
-                    arguments=queue.get('arguments', {})
-                )
-                logger.info(f"✅ Cola creada: {queue['name']}")
-            except Exception as e:
-                logger.warning(f"⚠️  Cola {queue['name']} ya existe o error: {e}")
+                self._declare_queue(queue)
+            except ChannelClosedByBroker as e:
+                self._reopen_channel()
+                if e.reply_code != 406 or queue['name'] not in RECREATE_ON_MISMATCH:
+                    logger.error(f"❌ Cola {queue['name']} error: {e}")
+                    raise
+                self._recreate_queue(queue)
+            logger.info(f"✅ Cola creada: {queue['name']}")
     
     def create_bindings(self):
         """Crea los bindings entre exchanges y colas"""
@@ -161,7 +226,8 @@ class RabbitMQSetup:
                 'routing_key': 'pdf.process'
             },
             {
-                'queue': 'pdf.process.priority',
+                # Los jobs urgentes van a la misma cola, diferenciados por priority
+                'queue': 'pdf.process',
                 'exchange': 'tutor.processing',
                 'routing_key': 'pdf.process.priority'
             },
@@ -196,8 +262,26 @@ class RabbitMQSetup:
                 )
                 logger.info(f"✅ Binding creado: {binding['queue']} -> {binding['exchange']} [{binding['routing_key']}]")
             except Exception as e:
-                logger.warning(f"⚠️  Binding {binding['queue']} -> {binding['exchange']} error: {e}")
+                logger.error(f"❌ Binding {binding['queue']} -> {binding['exchange']} error: {e}")
+                raise
     
+    def remove_legacy_queues(self):
+        """Borra las colas antiguas (y con ellas sus bindings)"""
+        for name in LEGACY_QUEUES:
+            try:
+                self.channel.queue_declare(queue=name, passive=True)
+            except ChannelClosedByBroker:
+                # 404: no existe, nada que migrar
+                self._reopen_channel()
+                continue
+            try:
+                self.channel.queue_delete(queue=name, if_empty=True)
+            except ChannelClosedByBroker as e:
+                self._reopen_channel()
+                logger.error(f"❌ No se pudo borrar la cola antigua {name} (¿tiene mensajes? vacíala antes): {e}")
+                raise
+            logger.info(f"🗑️  Cola antigua eliminada: {name}")
+
     def setup_all(self):
         """Ejecuta todo el setup"""
         if not self.connect():
@@ -219,6 +303,10 @@ class RabbitMQSetup:
             logger.info("🔗 Creando bindings...")
             self.create_bindings()
             
+            # Migración: colas que ya no se usan
+            logger.info("🧹 Eliminando colas antiguas...")
+            self.remove_legacy_queues()
+            
             logger.info("✅ Configuración completada exitosamente!")
             return True
             
@@ -0,0 +1,27 @@
+"""
+Nombres y argumentos de colas compartidos entre rabbitmq_setup.py (que crea
+la topología) y los workers (que la consumen). Cambiar un valor aquí obliga
+a volver a ejecutar el setup: el worker solo comprueba que las colas existen.
+"""
+
+# Cola de entrada del worker de PDFs de ingeniería
+PDF_ENGINEERING_QUEUE = 'pdf.process.engineering'
+
+# Colas de espera con TTL fijo (segundos). Al expirar, el mensaje vuelve a
+# PDF_ENGINEERING_QUEUE vía dead-letter; un TTL por cola evita el bloqueo en
+# cabeza que provoca el `expiration` por mensaje en colas clásicas
+RETRY_BUCKETS = (10, 40, 160, 640)
+
+
+def retry_queue_name(ttl: int) -> str:
+    """Nombre de la cola de espera de `ttl` segundos"""
+    return f'retry.{ttl}'
+
+
+def retry_queue_arguments(ttl: int) -> dict:
+    """Argumentos de la cola de espera de `ttl` segundos"""
+    return {
+        'x-message-ttl': ttl * 1000,
+        'x-dead-letter-exchange': '',
+        'x-dead-letter-routing-key': PDF_ENGINEERING_QUEUE
+    }
@@ -83,6 +83,13 @@ class MinIOClient:
             
             metadata['md5'] = md5_hash
             
+            # Si el objeto ya existe con el mismo contenido (p.ej. un reintento),
+            # no se vuelve a subir
+            etag = self._find_identical(bucket_name, object_name, md5_hash)
+            if etag is not None:
+                logger.info(f"Archivo sin cambios, se omite la subida: {bucket_name}/{object_name}")
+                return True, etag
+            
             # Subir archivo
             result = self.client.put_object(
                 bucket_name,
@@ -103,6 +110,32 @@ class MinIOClient:
             logger.error(f"Error inesperado al subir archivo: {e}")
             return False, str(e)
     
+    def _find_identical(self, bucket_name: str, object_name: str, md5_hash: str) -> Optional[str]:
+        """
+        Comprobar si el objeto ya existe con el mismo MD5. Siempre se pregunta
+        a MinIO: el objeto puede haberse borrado o cambiado fuera de este
+        cliente (reglas de ciclo de vida, otra réplica, la consola)
+        
+        Args:
+            bucket_name: Nombre del bucket
+            object_name: Nombre del objeto
+            md5_hash: MD5 del contenido a subir
+            
+        Returns:
+            ETag del objeto existente si el contenido coincide, None si no
+        """
+        try:
+            stat = self.client.stat_object(bucket_name, object_name)
+        except S3Error:
+            return None
+        
+        # El MD5 se guarda como metadato propio en upload_file: vale también
+        # para subidas multipart, donde el ETag no es el MD5
+        if stat.metadata.get('x-amz-meta-md5') != md5_hash:
+            return None
+        
+        return stat.etag
+    
     def download_file(
         self,
         bucket_name: str,
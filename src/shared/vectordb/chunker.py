@@ -1,6 +1,9 @@
 import re
 from typing import List
 
+# Separador de párrafos (línea en blanco), compilado una sola vez
+_PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+
 class EngineeringChunker:
     """
     Divisor de texto consciente de LaTeX y Estructura.
@@ -15,9 +18,30 @@ class EngineeringChunker:
         """Devuelve True si los bloques matemáticos están balanceados (pares)."""
         return text.count("$$") % 2 == 0
 
+    def _overlap_tail(self, text: str) -> str:
+        """
+        Últimos chunk_overlap caracteres, empezando en un límite de palabra
+        para que el siguiente chunk no arranque con media palabra.
+        """
+        if self.chunk_overlap <= 0:
+            return ""
+        if self.chunk_overlap >= len(text):
+            return text
+        tail = text[-self.chunk_overlap:]
+        if text[-self.chunk_overlap - 1].isspace():
+            return tail
+        cut = next((i for i, ch in enumerate(tail) if ch.isspace()), -1)
+        return tail[cut + 1:] if cut != -1 else tail
+
     def split_text(self, text: str) -> List[str]:
         text = text.replace('\r\n', '\n')
-        paragraphs = re.split(r'\n\s*\n', text)
+
+        # Camino rápido: un texto corto es un único chunk
+        if len(text) <= self.chunk_size:
+            text = text.strip()
+            return [text] if text else []
+
+        paragraphs = _PARAGRAPH_BREAK.split(text)
         
         chunks = []
         current_chunk = []
@@ -29,13 +53,13 @@ class EngineeringChunker:
             
             para_len = len(para)
             
-            if current_length + para_len > self.chunk_size:
+            if current_chunk and current_length + para_len > self.chunk_size:
                 temp_text = "\n\n".join(current_chunk)
                 
                 if self.validate_math_integrity(temp_text):
                     chunks.append(temp_text)
-                    overlap_text = temp_text[-self.chunk_overlap:] if self.chunk_overlap < len(temp_text) else temp_text
-                    current_chunk = [overlap_text, para]
+                    overlap_text = self._overlap_tail(temp_text)
+                    current_chunk = [overlap_text, para] if overlap_text else [para]
                     current_length = len(overlap_text) + para_len
                 else:
                     # FORZAR EXTENSIÓN: Estamos dentro de una ecuación
@@ -1,5 +1,10 @@
 import os
+import asyncio
+import hashlib
 import logging
+import unicodedata
+from array import array
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass, field
 
@@ -10,6 +15,13 @@ from openai import AsyncOpenAI
 
 logger = logging.getLogger(__name__)
 
+# Embeddings de preguntas recientes, compartidos por todas las instancias del
+# proceso (el gateway crea un QdrantService por petición)
+# Vectores guardados como array('f'): ~6 KB por entrada (1536 float32) frente
+# a ~49 KB como lista de floats; 2048 entradas son ~12 MB por proceso
+QUERY_EMBEDDING_CACHE_SIZE = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", 2048))
+_query_embeddings: "OrderedDict[str, array]" = OrderedDict()
+
 # --- DTOs (Data Transfer Objects) ---
 # Definimos estos objetos AQUÍ para no depender de otros módulos
 @dataclass
@@ -45,6 +57,10 @@ class QdrantService:
         self.openai_client = AsyncOpenAI(api_key=openai_key)
         self.embedding_model = "text-embedding-3-small"
         self.vector_size = 1536
+        # Textos por petición de embeddings (OpenAI admite hasta 2048 y un
+        # límite de tokens por petición) y peticiones simultáneas
+        self.embedding_batch_size = int(os.getenv("EMBEDDING_BATCH_SIZE", 512))
+        self._embedding_sem = asyncio.Semaphore(int(os.getenv("EMBEDDING_CONCURRENCY", 4)))
 
     async def ensure_collection(self):
         """Crea la colección si no existe (Idempotente)"""
@@ -58,6 +74,14 @@ class QdrantService:
                 vectors_config=models.VectorParams(
                     size=self.vector_size,
                     distance=models.Distance.COSINE
+                ),
+                # Copia int8 de los vectores en RAM (4x menos memoria); los
+                # originales float32 quedan para el rescore en search()
+                quantization_config=models.ScalarQuantization(
+                    scalar=models.ScalarQuantizationConfig(
+                        type=models.ScalarType.INT8,
+                        always_ram=True
+                    )
                 )
             )
         except Exception as e:
@@ -65,19 +89,52 @@ class QdrantService:
             # No lanzamos error aquí para permitir reintentos, pero logueamos fuerte
 
     async def _get_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
-        """Genera vectores usando OpenAI"""
+        """
+        Genera vectores usando OpenAI.
+        Una petición por cada embedding_batch_size textos, en paralelo: un PDF
+        largo no supera el límite por petición ni paga un round-trip por chunk.
+        """
         # Limpieza básica para mejorar calidad de embeddings
         clean_texts = [t.replace("\n", " ") for t in texts]
-        try:
-            response = await self.openai_client.embeddings.create(
-                input=clean_texts,
-                model=self.embedding_model
-            )
-            # Ordenamos por índice para asegurar correspondencia
-            return [data.embedding for data in response.data]
-        except Exception as e:
-            logger.error(f"❌ Error conectando con OpenAI: {e}")
-            raise e
+        size = self.embedding_batch_size
+        batches = await asyncio.gather(*(
+            self._embed_request(clean_texts[start:start + size])
+            for start in range(0, len(clean_texts), size)
+        ))
+        return [vector for batch in batches for vector in batch]
+
+    async def _embed_request(self, texts: List[str]) -> List[List[float]]:
+        """Una única petición de embeddings a OpenAI"""
+        async with self._embedding_sem:
+            try:
+                response = await self.openai_client.embeddings.create(
+                    input=texts,
+                    model=self.embedding_model
+                )
+            except Exception as e:
+                logger.error(f"❌ Error conectando con OpenAI: {e}")
+                raise e
+        # Ordenamos por índice para asegurar correspondencia
+        return [data.embedding for data in sorted(response.data, key=lambda d: d.index)]
+
+    async def embed_query(self, query: str) -> List[float]:
+        """
+        Embedding de una pregunta con caché LRU en memoria. La clave incluye el
+        modelo (cambiarlo invalida la caché) y la pregunta normalizada.
+        """
+        normalized = unicodedata.normalize("NFKC", query).strip().lower()
+        key = hashlib.sha256(f"{self.embedding_model}\0{normalized}".encode("utf-8")).hexdigest()
+
+        cached = _query_embeddings.get(key)
+        if cached is not None:
+            _query_embeddings.move_to_end(key)
+            return cached.tolist()
+
+        vector = (await self._get_embeddings_batch([query]))[0]
+        _query_embeddings[key] = array('f', vector)
+        if len(_query_embeddings) > QUERY_EMBEDDING_CACHE_SIZE:
+            _query_embeddings.popitem(last=False)
+        return vector
 
     async def upsert_chunks(self, chunks: List[VectorChunk]):
         """
@@ -92,27 +149,23 @@ class QdrantService:
         # 1. Generar Embeddings
         vectors = await self._get_embeddings_batch(texts)
 
-        # 2. Preparar Puntos Qdrant
-        points = []
-        for i, chunk in enumerate(chunks):
-            # Guardamos el texto en el payload para poder recuperarlo (RAG)
-            payload = chunk.metadata.copy()
-            payload["text_content"] = chunk.text 
-
-            points.append(models.PointStruct(
-                id=chunk.id,
-                vector=vectors[i],
-                payload=payload
-            ))
+        # 2. Preparar Puntos Qdrant en columnas (ids, vectores, payloads):
+        # un único models.Batch en vez de un PointStruct por chunk
+        # Guardamos el texto en el payload para poder recuperarlo (RAG)
+        batch = models.Batch(
+            ids=[chunk.id for chunk in chunks],
+            vectors=vectors,
+            payloads=[{**chunk.metadata, "text_content": chunk.text} for chunk in chunks]
+        )
 
         # 3. Subir
         await self.ensure_collection()
         await self.client.upsert(
             collection_name=self.collection_name, 
-            points=points,
+            points=batch,
             wait=True # Esperamos confirmación
         )
-        logger.info(f"💾 Insertados {len(points)} vectores en Qdrant.")
+        logger.info(f"💾 Insertados {len(chunks)} vectores en Qdrant.")
 
     async def search(self, query: str, filters: Dict[str, Any] = None, limit: int = 5) -> List[SearchResult]:
         """
@@ -120,8 +173,7 @@ class QdrantService:
         Devuelve objetos genéricos SearchResult.
         """
         # 1. Vectorizar la query
-        query_vectors = await self._get_embeddings_batch([query])
-        query_vector = query_vectors[0]
+        query_vector = await self.embed_query(query)
         
         # 2. Construir Filtros de Qdrant
         qdrant_filter = None
@@ -140,6 +192,10 @@ class QdrantService:
             collection_name=self.collection_name,
             query_vector=query_vector,
             query_filter=qdrant_filter,
+            # Candidatos con int8 y reordenados con los vectores originales
+            search_params=models.SearchParams(
+                quantization=models.QuantizationSearchParams(rescore=True, oversampling=2.0)
+            ),
             limit=limit,
             with_payload=True
         )
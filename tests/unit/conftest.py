@@ -0,0 +1,9 @@
+import os
+import sys
+
+# Mismo layout que los contenedores: 'shared' importable desde src/ y los
+# módulos del worker desde su propio directorio (/app en el Dockerfile)
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, ROOT)  # imports 'src.services...' del gateway
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, os.path.join(ROOT, 'src', 'services', 'processor', 'workers'))
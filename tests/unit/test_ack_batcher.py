@@ -0,0 +1,111 @@
+import asyncio
+
+from ack_batcher import AckBatcher
+
+
+class FakeMessage:
+    def __init__(self, channel, delivery_tag):
+        self.channel = channel
+        self.delivery_tag = delivery_tag
+        self.acks = []
+        self.rejects = []
+
+    async def ack(self, multiple=False):
+        self.acks.append(multiple)
+
+    async def reject(self, requeue=False):
+        self.rejects.append(requeue)
+
+
+def _tracked(batcher, channel, *tags):
+    messages = [FakeMessage(channel, tag) for tag in tags]
+    for message in messages:
+        batcher.track(message)
+    return messages
+
+
+def test_in_order_completions_share_one_multiple_ack():
+    async def scenario():
+        acks = AckBatcher(batch_size=2, interval=0.5)
+        m1, m2 = _tracked(acks, object(), 1, 2)
+
+        await acks.done(m1)
+        assert m1.acks == []
+
+        await acks.done(m2)
+        assert m1.acks == []
+        assert m2.acks == [True]
+
+    asyncio.run(scenario())
+
+
+def test_out_of_order_completion_is_acked_immediately():
+    async def scenario():
+        acks = AckBatcher(batch_size=4, interval=0.5)
+        m1, m2, m3 = _tracked(acks, object(), 1, 2, 3)
+
+        # m1 sigue en proceso: m2 y m3 no pueden esperar a la marca
+        await acks.done(m2)
+        await acks.done(m3)
+        assert m2.acks == [False]
+        assert m3.acks == [False]
+
+        await acks.done(m1)
+        await acks.flush()
+        assert m1.acks == [True]
+        assert not acks.is_pending(m1)
+
+    asyncio.run(scenario())
+
+
+def test_failed_flushes_pending_and_rejects_only_that_message():
+    async def scenario():
+        acks = AckBatcher(batch_size=4, interval=0.5)
+        m1, m2, m3 = _tracked(acks, object(), 1, 2, 3)
+
+        await acks.done(m1)
+        await acks.failed(m2)
+        assert m1.acks == [True]
+        assert m2.rejects == [False]
+        assert m2.acks == []
+
+        # m3 queda como cabeza del tramo contiguo
+        await acks.done(m3)
+        await acks.flush()
+        assert m3.acks == [True]
+
+    asyncio.run(scenario())
+
+
+def test_new_channel_resets_state_and_ignores_stale_messages():
+    async def scenario():
+        acks = AckBatcher(batch_size=4, interval=0.5)
+        old_channel, new_channel = object(), object()
+        (stale,) = _tracked(acks, old_channel, 1)
+        (fresh,) = _tracked(acks, new_channel, 1)
+
+        # Mismo delivery tag en otro canal: no se confirma ni se rechaza
+        await acks.done(stale)
+        await acks.failed(stale)
+        assert stale.acks == [] and stale.rejects == []
+        assert acks.is_pending(fresh)
+
+        await acks.done(fresh)
+        await acks.flush()
+        assert fresh.acks == [True]
+
+    asyncio.run(scenario())
+
+
+def test_settled_message_is_not_settled_twice():
+    async def scenario():
+        acks = AckBatcher(batch_size=4, interval=0.5)
+        m1, m2 = _tracked(acks, object(), 1, 2)
+
+        await acks.done(m2)
+        await acks.failed(m2)
+        assert m2.acks == [False]
+        assert m2.rejects == []
+        assert acks.is_pending(m1)
+
+    asyncio.run(scenario())
@@ -0,0 +1,71 @@
+from shared.vectordb.chunker import EngineeringChunker
+
+
+def test_short_text_is_a_single_stripped_chunk():
+    chunker = EngineeringChunker(chunk_size=100, chunk_overlap=20)
+
+    assert chunker.split_text("  Ley de Ohm: $V = IR$\r\n\r\n") == ["Ley de Ohm: $V = IR$"]
+
+
+def test_empty_or_blank_text_has_no_chunks():
+    chunker = EngineeringChunker(chunk_size=100, chunk_overlap=20)
+
+    assert chunker.split_text("") == []
+    assert chunker.split_text(" \n\n \n") == []
+
+
+def test_long_text_splits_on_paragraph_breaks():
+    chunker = EngineeringChunker(chunk_size=50, chunk_overlap=0)
+    paragraphs = ["a" * 30, "b" * 30, "c" * 30]
+
+    chunks = chunker.split_text("\n\n".join(paragraphs))
+
+    # Sin solapamiento, cada párrafo es un chunk tal cual
+    assert chunks == paragraphs
+
+
+def test_blank_paragraphs_do_not_produce_empty_chunks():
+    chunker = EngineeringChunker(chunk_size=40, chunk_overlap=0)
+    text = "uno " * 8 + "\n\n   \n\n" + "dos " * 8 + "\n \n" + "tres " * 6
+
+    chunks = chunker.split_text(text)
+
+    assert chunks
+    assert all(chunk.strip() for chunk in chunks)
+
+
+def test_overlap_starts_on_a_word_boundary():
+    chunker = EngineeringChunker(chunk_size=10, chunk_overlap=8)
+
+    # Los últimos 8 caracteres son "ia final": se salta la media palabra
+    assert chunker._overlap_tail("energia final") == "final"
+    # Un texto más corto que el solapamiento se conserva entero
+    assert chunker._overlap_tail("corto") == "corto"
+
+
+def test_overlap_keeps_a_tail_that_already_starts_a_word():
+    chunker = EngineeringChunker(chunk_size=10, chunk_overlap=5)
+
+    assert chunker._overlap_tail("el campo") == "campo"
+
+
+def test_next_chunk_does_not_start_mid_word():
+    chunker = EngineeringChunker(chunk_size=60, chunk_overlap=15)
+    first = "La energía cinética depende de la masa y la velocidad"
+    second = "El trabajo es la integral de la fuerza sobre el camino"
+
+    chunks = chunker.split_text(f"{first}\n\n{second}")
+
+    assert len(chunks) == 2
+    overlap = chunks[1].split("\n\n")[0]
+    assert first.endswith(overlap)
+    assert first[len(first) - len(overlap) - 1] == " "
+
+
+def test_open_display_math_is_not_split():
+    chunker = EngineeringChunker(chunk_size=30, chunk_overlap=0)
+    text = "$$\n\n" + "x + y = z " * 4 + "\n\n$$\n\n" + "texto " * 6
+
+    chunks = chunker.split_text(text)
+
+    assert all(chunker.validate_math_integrity(chunk) for chunk in chunks)
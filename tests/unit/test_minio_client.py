@@ -0,0 +1,71 @@
+import hashlib
+from io import BytesIO
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("minio")
+
+from minio.error import S3Error  # noqa: E402
+from shared.storage.minio_client import MinIOClient  # noqa: E402
+
+
+class FakeMinio:
+    """Objetos en memoria: nombre -> metadatos de usuario"""
+
+    def __init__(self):
+        self.objects = {}
+        self.puts = 0
+
+    def stat_object(self, bucket_name, object_name):
+        if (bucket_name, object_name) not in self.objects:
+            raise S3Error("NoSuchKey", "Object does not exist", object_name, None, None, None)
+        meta = self.objects[(bucket_name, object_name)]
+        return SimpleNamespace(
+            metadata={'x-amz-meta-md5': meta['md5']},
+            etag=f"etag-{meta['md5']}"
+        )
+
+    def put_object(self, bucket_name, object_name, data, length, content_type=None, metadata=None):
+        self.puts += 1
+        self.objects[(bucket_name, object_name)] = dict(metadata)
+        return SimpleNamespace(etag=f"etag-{metadata['md5']}")
+
+
+def _client():
+    client = MinIOClient(endpoint="localhost:9000")
+    client.client = FakeMinio()
+    return client
+
+
+def _upload(client, payload: bytes):
+    return client.upload_file("processed", "job/result.json", BytesIO(payload), len(payload))
+
+
+def test_identical_content_is_not_uploaded_again():
+    client = _client()
+    assert _upload(client, b"{}")[0]
+    ok, etag = _upload(client, b"{}")
+
+    assert ok
+    assert client.client.puts == 1
+    assert etag == f"etag-{hashlib.md5(b'{}').hexdigest()}"
+
+
+def test_object_deleted_outside_the_client_is_uploaded_again():
+    client = _client()
+    _upload(client, b"{}")
+    # Borrado por una regla de ciclo de vida, otra réplica o la consola
+    client.client.objects.clear()
+
+    assert _upload(client, b"{}")[0]
+    assert client.client.puts == 2
+    assert ("processed", "job/result.json") in client.client.objects
+
+
+def test_changed_content_is_uploaded():
+    client = _client()
+    _upload(client, b"{}")
+    assert _upload(client, b'{"pages": 3}')[0]
+
+    assert client.client.puts == 2
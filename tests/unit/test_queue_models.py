@@ -0,0 +1,61 @@
+import pytest
+
+pytest.importorskip("pydantic")
+
+from pydantic import ValidationError  # noqa: E402
+from shared.queue.models import PDFProcessingJob  # noqa: E402
+
+
+def _message(**fields):
+    message = {"job_id": "job-1", "minio_object_key": "job-1.pdf"}
+    message.update(fields)
+    return message
+
+
+def test_missing_optional_fields_take_their_defaults():
+    job = PDFProcessingJob.model_validate(_message())
+
+    assert job.minio_bucket == "uploads"
+    assert job.filename == "unknown"
+    assert job.course_id == "general"
+    assert job.university_id == "global"
+    assert job.doc_type == "notes"
+
+
+def test_null_metadata_is_kept_as_none():
+    job = PDFProcessingJob.model_validate(_message(
+        filename=None, course_id=None, university_id=None, doc_type=None
+    ))
+
+    assert job.filename is None
+    assert job.course_id is None
+    assert job.university_id is None
+    assert job.doc_type is None
+
+
+def test_null_bucket_falls_back_to_uploads():
+    job = PDFProcessingJob.model_validate(_message(minio_bucket=None))
+
+    assert job.minio_bucket == "uploads"
+
+
+def test_extra_fields_from_the_gateway_are_ignored():
+    # documents.py también envía status y user_id
+    job = PDFProcessingJob.model_validate(_message(status="queued", user_id="u-1"))
+
+    assert job.job_id == "job-1"
+    assert not hasattr(job, "user_id")
+
+
+@pytest.mark.parametrize("field", ["job_id", "minio_object_key"])
+def test_missing_required_field_is_rejected(field):
+    message = _message()
+    del message[field]
+
+    with pytest.raises(ValidationError):
+        PDFProcessingJob.model_validate(message)
+
+
+def test_null_required_field_is_rejected():
+    with pytest.raises(ValidationError):
+        PDFProcessingJob.model_validate(_message(minio_object_key=None))
@@ -0,0 +1,106 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("redis")
+pytest.importorskip("structlog")
+pytest.importorskip("pydantic_settings")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src', 'services', 'processor'))
+
+from app.core.redis_client import RedisClient  # noqa: E402
+
+
+def _text(value):
+    # decode_responses=True: Redis devuelve str aunque se escriban bytes
+    return value.decode('utf-8') if isinstance(value, bytes) else str(value)
+
+
+class FakePipeline:
+    def __init__(self, data):
+        self.data = data
+        self.ops = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def delete(self, key):
+        self.ops.append(lambda: self.data.pop(key, None))
+
+    def hset(self, key, mapping):
+        self.ops.append(lambda: self.data.setdefault(key, {}).update(
+            {field: _text(value) for field, value in mapping.items()}
+        ))
+
+    def expire(self, key, seconds):
+        self.ops.append(lambda: None)
+
+    async def execute(self):
+        for op in self.ops:
+            op()
+
+
+class FakeRedis:
+    """Hashes en memoria; el script emula _UPDATE_FIELDS_LUA"""
+
+    def __init__(self):
+        self.data = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self.data)
+
+    async def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    async def update_script(self, keys, args):
+        fields = self.data.get(keys[0])
+        if fields is None:
+            return None
+        pairs = args[1:]
+        for field, value in zip(pairs[::2], pairs[1::2]):
+            fields[field] = _text(value)
+        return [item for pair in fields.items() for item in pair]
+
+
+def _client():
+    client = RedisClient()
+    client.redis = FakeRedis()
+    client._update_script = client.redis.update_script
+    return client
+
+
+def test_lists_and_timestamps_survive_a_partial_update():
+    async def scenario():
+        client = _client()
+        status = {
+            "job_id": "job-1",
+            "status": "queued",
+            "created_at": 1760630400123,  # epoch-ms: más de 14 dígitos significativos
+            "chunk_ids": [],
+            "result": {"pages": [1, 2], "warnings": []},
+            "big_id": 2 ** 53 + 1,
+        }
+        await client.set_job_status("job-1", status)
+
+        changes = {"status": "completed", "completed_at": 1760630499999, "errors": []}
+        merged = await client.update_job_status("job-1", changes)
+
+        expected = {**status, **changes}
+        assert merged == expected
+        assert await client.get_job_status("job-1") == expected
+
+    asyncio.run(scenario())
+
+
+def test_update_of_missing_job_returns_none_and_creates_nothing():
+    async def scenario():
+        client = _client()
+        assert await client.update_job_status("missing", {"status": "cancelled"}) is None
+        assert await client.get_job_status("missing") is None
+
+    asyncio.run(scenario())
@@ -0,0 +1,94 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("pydantic")
+
+from src.services.solver import cache as cache_module  # noqa: E402
+from src.services.solver.cache import SemanticCache  # noqa: E402
+from src.services.solver.schemas import SolverResponse  # noqa: E402
+
+
+def _response(text):
+    return SolverResponse(
+        thought_process="-",
+        explanation_markdown=text,
+        concrete_example="-",
+        verification_question="-",
+        used_general_knowledge=False,
+    )
+
+
+def _unit(*values):
+    vector = np.asarray(values, dtype=np.float32)
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+def _cache(**kwargs):
+    params = dict(threshold=0.9, ttl=60, max_per_user=8, max_entries=100)
+    params.update(kwargs)
+    return SemanticCache(**params)
+
+
+def test_similar_question_with_same_context_hits():
+    cache = _cache()
+    cache.put("alice", _unit(1, 0, 0), "ctx", _response("respuesta"))
+
+    hit = cache.get("alice", _unit(1, 0.05, 0), "ctx")
+    assert hit is not None
+    assert hit.explanation_markdown == "respuesta"
+
+
+def test_dissimilar_question_misses():
+    cache = _cache()
+    cache.put("alice", _unit(1, 0, 0), "ctx", _response("respuesta"))
+
+    assert cache.get("alice", _unit(0, 1, 0), "ctx") is None
+
+
+def test_changed_context_misses():
+    cache = _cache()
+    cache.put("alice", _unit(1, 0, 0), "ctx-antes", _response("respuesta"))
+
+    # Mismos embeddings, pero la búsqueda devuelve otros chunks
+    assert cache.get("alice", _unit(1, 0, 0), "ctx-despues") is None
+
+
+def test_entries_are_isolated_per_user():
+    cache = _cache()
+    cache.put("alice", _unit(1, 0, 0), "ctx", _response("de alice"))
+
+    assert cache.get("bob", _unit(1, 0, 0), "ctx") is None
+
+
+def test_expired_entries_miss(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = _cache(ttl=10)
+    cache.put("alice", _unit(1, 0, 0), "ctx", _response("respuesta"))
+
+    now[0] += 9
+    assert cache.get("alice", _unit(1, 0, 0), "ctx") is not None
+    now[0] += 2
+    assert cache.get("alice", _unit(1, 0, 0), "ctx") is None
+
+
+def test_global_limit_evicts_least_recently_used():
+    cache = _cache(max_entries=2)
+    cache.put("alice", _unit(1, 0, 0), "ctx", _response("a"))
+    cache.put("bob", _unit(0, 1, 0), "ctx", _response("b"))
+    # Usar la de alice la convierte en la más reciente
+    assert cache.get("alice", _unit(1, 0, 0), "ctx") is not None
+    cache.put("carol", _unit(0, 0, 1), "ctx", _response("c"))
+
+    assert cache.get("bob", _unit(0, 1, 0), "ctx") is None
+    assert cache.get("alice", _unit(1, 0, 0), "ctx") is not None
+
+
+def test_hit_returns_a_copy():
+    cache = _cache()
+    cache.put("alice", _unit(1, 0, 0), "ctx", _response("respuesta"))
+
+    hit = cache.get("alice", _unit(1, 0, 0), "ctx")
+    hit.sources = []
+    hit.explanation_markdown = "modificada"
+    assert cache.get("alice", _unit(1, 0, 0), "ctx").explanation_markdown == "respuesta"